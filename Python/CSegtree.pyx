@@ -0,0 +1,260 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+'''
+Cython port of `Segtree` for 64-bit integers and a named operation.
+Build in place with
+    cythonize -i CSegtree.pyx
+after which `Segtree.CSegtree` uses it instead of the pure Python
+fallback.
+'''
+
+from libc.stdlib cimport malloc, free
+from libc.limits cimport LLONG_MAX, LLONG_MIN
+
+#Operation codes
+cdef enum:
+    SUM = 0
+    MIN = 1
+    MAX = 2
+    XOR = 3
+
+#op_name -> op_kind
+_OP_KINDS = {'sum': SUM, 'min': MIN, 'max': MAX, 'xor': XOR}
+
+cdef inline long long _combine(int op_kind, long long a, long long b) nogil:
+    '''Applies the operation with code `op_kind` to `a` and `b`'''
+    if op_kind == SUM:
+        return a + b
+    elif op_kind == MIN:
+        return a if a < b else b
+    elif op_kind == MAX:
+        return a if a > b else b
+    else:
+        return a ^ b
+
+
+
+cdef class CSegtree:
+    '''
+    A segtree for 64-bit integers and a named operation, with the
+    tree stored in a C array and `query`/`update` compiled to C.
+    Uses the same `2n` layout as `Segtree`: leaves are in seg[n:2n]
+    and seg[i] joins seg[2i] and seg[2i+1].
+    Sums wrap around on overflow like C integers.
+
+    Raises `IndexError`s to help with debugging.
+
+    Public Methods Summary:
+        __init__(self, a, op_name)
+            Creates a segtree with underlying array a and operation op_name
+        query(self, L, R)
+            Result of applying the operation on interval [L:R]
+        update(self, ind, val)
+            Updates an element of the underlying array and the whole segtree
+        update_many(self, pairs)
+            Updates several elements, checking every index first
+        get(self, ind)
+            Returns specified element of the underlying array
+        arr(self)
+            Returns a copy of the underlying array
+        iter_arr(self)
+            Returns an iterator over the underlying array without copying
+        len(seg), seg[ind], seg[ind] = val
+            Same as `n`, `get(ind)` and `update(ind, val)`
+    '''
+
+    #Instance attributes
+    #    seg      - C array to store the main segtree
+    #    n        - Number of items in the underlying list
+    #    op_kind  - Operation code
+    #    identity - Identity element of the operation
+    cdef long long* seg
+    cdef readonly Py_ssize_t n
+    cdef int op_kind
+    cdef long long identity
+
+
+
+    def __cinit__(self, a, str op_name):
+        '''
+        Initializes a segtree from an array and operation name.
+
+        Time complexity: `O(n)`
+
+        Parameters
+        ----------
+        `a` : list
+            The inputted array of integers
+        `op_name` : str
+            One of `'sum'`, `'min'`, `'max'`, `'xor'`
+
+        Raises
+        ------
+        ValueError
+            When `op_name` is not a known operation
+        '''
+        cdef Py_ssize_t i
+
+        if op_name not in _OP_KINDS:
+            raise ValueError(f'Unknown op_name: {op_name}')
+        self.op_kind = _OP_KINDS[op_name]
+        if self.op_kind == MIN:
+            self.identity = LLONG_MAX
+        elif self.op_kind == MAX:
+            self.identity = LLONG_MIN
+        else:
+            self.identity = 0
+
+        self.n = len(a)
+        #Allocate at least 1 slot so that `seg` is never NULL on success
+        self.seg = <long long*> malloc(max(2*self.n, 1) * sizeof(long long))
+        if self.seg == NULL:
+            raise MemoryError()
+        self.seg[0] = self.identity
+
+        #Copy `a` into the leaves and fill non-leaf nodes bottom up
+        for i in range(self.n):
+            self.seg[self.n + i] = a[i]
+        for i in range(self.n-1, 0, -1):
+            self.seg[i] = _combine(self.op_kind, 
+                                   self.seg[2*i], self.seg[2*i+1])
+
+    def __dealloc__(self):
+        free(self.seg)
+
+
+
+    cpdef long long query(self, Py_ssize_t L, Py_ssize_t R) except? -1:
+        '''
+        Returns the result of applying the operation on the interval
+        `[L:R]` of the underlying array.
+        Requires `0 <= L < R <= n`.
+
+        Time complexity: `O(logn)`
+        '''
+        cdef long long ans = self.identity
+        cdef Py_ssize_t l = L + self.n
+        cdef Py_ssize_t r = R + self.n
+
+        #Check that [L:R] is a valid interval
+        if L < 0 or R > self.n or L >= R:
+            msg = f'[L,R] = [{L},{R}] but segtree only has {self.n} elements'
+            raise IndexError(msg)
+        #The whole array is answered by the root
+        if L == 0 and R == self.n:
+            return self.seg[1]
+
+        #All named operations are commutative, so one accumulator suffices
+        while l < r:
+            if l & 1:
+                ans = _combine(self.op_kind, ans, self.seg[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                ans = _combine(self.op_kind, ans, self.seg[r])
+            l >>= 1
+            r >>= 1
+        return ans
+
+
+
+    cpdef update(self, Py_ssize_t ind, long long val):
+        '''
+        Updates the element at index `ind` to `val` and updates the
+        segtree accordingly.
+        Requires `-n <= ind <= n-1`.
+
+        Time complexity: `O(logn)`
+        '''
+        cdef Py_ssize_t i
+
+        #Check that ind is a valid index
+        if ind >= self.n or ind < -self.n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += self.n
+
+        i = self.n + ind
+        self.seg[i] = val
+        while i > 1:
+            i >>= 1
+            self.seg[i] = _combine(self.op_kind, 
+                                   self.seg[2*i], self.seg[2*i+1])
+
+
+
+    def update_many(self, pairs):
+        '''
+        Updates the element at index `ind` to `val` for every pair
+        `(ind, val)` in `pairs`, then updates the segtree accordingly.
+        Later pairs take precedence for repeated indices.
+        Requires `-n <= ind <= n-1` for every `ind`.
+
+        Time complexity: `O(mlogn)` for `m` pairs
+
+        Raises
+        ------
+        IndexError
+            When an `ind` is out of bounds, before anything is updated
+        '''
+        #Check that every ind is valid before updating anything
+        pairs = list(pairs)
+        for ind, val in pairs:
+            if ind >= self.n or ind < -self.n:
+                msg = f'Getting from index out of range: ind = {ind}'
+                raise IndexError(msg)
+        for ind, val in pairs:
+            self.update(ind, val)
+
+
+
+    cpdef long long get(self, Py_ssize_t ind) except? -1:
+        '''
+        Returns the item at index `ind` in the underlying array.
+        Requires `-n <= ind <= n-1`.
+
+        Runtime: `O(1)`
+        '''
+        #Check that ind is a valid index
+        if ind >= self.n or ind < -self.n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += self.n
+        return self.seg[self.n + ind]
+
+
+
+    def arr(self):
+        '''
+        Creates and returns a copy of the underlying array.
+
+        Time complexity: `O(n)`
+        '''
+        return [self.seg[self.n + i] for i in range(self.n)]
+
+
+
+    def iter_arr(self):
+        '''
+        Returns an iterator over the underlying array, without 
+        allocating a copy of it like `arr` does.
+        The segtree should not be updated while iterating.
+
+        Time complexity: `O(n)` to iterate through
+        '''
+        cdef Py_ssize_t i
+        for i in range(self.n):
+            yield self.seg[self.n + i]
+
+    def __len__(self):
+        '''Returns the number of items in the underlying array'''
+        return self.n
+
+    def __getitem__(self, Py_ssize_t ind):
+        '''Returns the item at index `ind`, same as `get(ind)`'''
+        return self.get(ind)
+
+    def __setitem__(self, Py_ssize_t ind, long long val):
+        '''Updates the item at index `ind` to `val`, same as `update`'''
+        self.update(ind, val)
@@ -1,3 +1,20 @@
+import operator
+from itertools import islice
+
+#Optional; used to vectorize the build for named operations
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#Optional; used to compile the kernels of `SegtreeNumeric`
+try:
+    from numba import njit
+except ImportError:
+    #Without numba the kernels run as plain Python functions
+    def njit(f):
+        return f
+
 class Segtree:
     '''
     A basic segtree implementation.
@@ -11,34 +28,59 @@ class Segtree:
     `n` is the number of items in the underlying array.
     `T` is the type of the items in the underlying array.
 
-    Implementation uses `None` to pad out the data structure 
-    to a perfect binary tree. 
+    Implementation uses the iterative layout with `2n` nodes, so no
+    padding is needed. `None` is treated as an empty value by the
+    join operation unless its identity element is provided, in which
+    case `op` is called directly without any `None` handling.
+
+    Common numeric operations can be selected by name with `op_name`, 
+    in which case arrays of floats are built level by level with numpy 
+    ufuncs if numpy is installed.
 
     Raises `IndexError`s to help with debugging.
 
     Public Methods Summary:
-        __init__(self, a, op)
+        __init__(self, a, op=None, identity=None, op_name=None, dtype=None)
             Creates a segtree with underlying array a and join operation op
         query(self, L, R)
             Result of applying the operation on interval [L:R]
         update(self, ind, val)
             Updates an element of the underlying array and the whole segtree
+        update_many(self, pairs)
+            Updates several elements, recomputing each affected node once
         get(self, ind)
             Returns specified element of the underlying array
         arr(self)
             Returns a copy of the underlying array
+        iter_arr(self)
+            Returns an iterator over the underlying array without copying
+        len(seg), seg[ind], seg[ind] = val
+            Same as `n`, `get(ind)` and `update(ind, val)`
     '''
     
     #Instance attributes
-    #    n    - Number of items in the underlying list
-    #    op   - Join operator; modified to handle `None` inputs
-    #    seg  - Array to store the main segtree
-    #    span - span[i] = interval [L:R] corresponding to seg[i]
-    #    l    - Length of seg
-
-
-
-    def __init__(self, a: list, op: 'function') -> 'Segtree':
+    #    n        - Number of items in the underlying list
+    #    op       - Join operator; modified to handle `None` inputs 
+    #               unless `identity` is given
+    #    identity - Identity element of `op`, or `None` if not given
+    #    seg      - Array to store the main segtree; leaves are in
+    #               seg[n:2n] and seg[i] joins seg[2i] and seg[2i+1]
+    #    full     - True iff seg[1] is the result of query(0, n), which 
+    #               holds if `n` is a power of 2 or `op` is commutative
+    __slots__ = ('n', 'op', 'identity', 'seg', 'full')
+
+    #Named operations: op_name -> (join operator, identity)
+    _NAMED_OPS = {
+        'sum': (operator.add, 0),
+        'min': (min, float('inf')),
+        'max': (max, float('-inf')),
+        'xor': (operator.xor, 0),
+    }
+
+
+
+    def __init__(self, a: list, op: 'function' = None, identity=None, 
+                 op_name: str = None, dtype=None) -> 'Segtree':
         '''
         Initializes a segtree from an array and join operator.
 
@@ -49,49 +91,107 @@ class Segtree:
         `a` : list
             The inputted array
         `op` : function
-            Operation to join segments
+            Operation to join segments. Not allowed with `op_name`.
+        `identity` : optional
+            Identity element of `op` (e.g. `0` for sum, `inf` for min).
+            If given, `op` is used without any `None` handling.
+        `op_name` : str, optional
+            One of `'sum'`, `'min'`, `'max'`, `'xor'`. Used instead of 
+            `op`, and `identity` defaults to the identity of the operation.
+        `dtype` : optional
+            Only `float` (numpy float64) is allowed, which converts the 
+            leaves to floats and builds with numpy. Without `dtype`, 
+            only arrays whose elements are all floats are built with 
+            numpy, since other dtypes do not match Python scalars (e.g. 
+            numpy ints overflow). Use `SegtreeNumeric` for other dtypes.
+            Ignored without numpy.
         
         Returns
         -------
             A segtree initialized from `a` and join operator `op`
+
+        Raises
+        ------
+        ValueError
+            When `op_name` is not a known operation, when not exactly 
+            one of `op` and `op_name` is given, or when `dtype` is not 
+            float64
         '''
         
         #Initialize other fields
         self.n = len(a)
-        #Modify `op` to handle `None` inputs
-        def op_none(a,b):
-            if a == None and b == None:
-                return None
-            elif a == None:
-                return b
-            elif b == None:
-                return a
+
+        #Check that exactly one of `op` and `op_name` is given
+        if (op is None) == (op_name is None):
+            raise ValueError('Exactly one of op and op_name must be given')
+
+        #Look up a named operation and build `seg` with numpy if it 
+        #gives the same results as building with Python scalars
+        vectorized = False
+        if op_name is not None:
+            if op_name not in Segtree._NAMED_OPS:
+                raise ValueError(f'Unknown op_name: {op_name}')
+            op, default = Segtree._NAMED_OPS[op_name]
+            if np is not None:
+                if dtype is not None and np.dtype(dtype) != np.float64:
+                    msg = f'Segtree cannot build with dtype {dtype}, ' \
+                          f'use SegtreeNumeric instead'
+                    raise ValueError(msg)
+                #Check the elements before converting, which stops at 
+                #the first non-float instead of converting all of `a`
+                vectorized = (dtype is not None 
+                              or all(map(float.__instancecheck__, a)))
+            if vectorized:
+                leaves = np.asarray(a, dtype=np.float64)
+                seg, _ = Segtree._np_build(leaves, op_name)
+                #Back to a list so that single elements are Python scalars
+                self.seg = seg.tolist()
+            #The identity of the dtype may not be one for Python scalars
+            if identity is None:
+                identity = default
+
+        self.identity = identity
+        #Named operations are all commutative
+        self.full = op_name is not None or self.n & (self.n-1) == 0
+        if identity is None:
+            #Modify `op` to handle `None` inputs
+            def op_none(a,b):
+                if a is None and b is None:
+                    return None
+                elif a is None:
+                    return b
+                elif b is None:
+                    return a
+                else:
+                    return op(a,b)
+            self.op = op_none
+        else:
+            #Empty values are the identity, so `op` can be used as is
+            self.op = op
+
+        #`seg` was already built with numpy
+        if vectorized:
+            return
+
+        #Initialize non-leaf nodes of `seg` with `identity` (`None` if not 
+        #given) using a single C-level list repeat
+        seg = self.seg = [identity] * self.n
+
+        #Copy `a` into the leaves of `seg`
+        seg += a
+
+        #Run the join operation to fill non-leaf nodes of `seg` bottom up,
+        #one level at a time (see `_levels`).
+        #`None` inputs are handled inline to skip calls to `op_none`.
+        for lo, hi in Segtree._levels(self.n):
+            if identity is None:
+                for i in range(lo, hi):
+                    x = seg[2*i]
+                    y = seg[2*i+1]
+                    seg[i] = x if y is None else (y if x is None else op(x,y))
             else:
-                return op(a,b)
-        self.op = op_none
-
-        #Calculate the length 
-        k = 2 ** Segtree._ceil_log_2(self.n)   #Number of leaves (padded)
-        self.l = 2*k - 1                       #Number of nodes
-
-        #Initialize `seg`` with `None`s. Unused nodes will remain as `None`
-        self.seg = [None for i in range(self.l)]
-        #Initialize `span` with [n:n], the empty interval at the end
-        self.span = [[self.n,self.n] for i in range(self.l)]
-
-        #Initialize leaves of `seg` and `span`
-        for i in range(self.n):
-            #Copy `a` into the leaves of `seg`
-            self.seg[i + k-1] = a[i]
-            #Initilize `span` for the leaves
-            self.span[i + k-1] = [i,i+1]
-        
-        #Initialize non-leaf nodes of `seg` and `span` bottom up
-        for i in range(k-2,-1,-1):
-            #Run the join operation to fill non-leaf nodes of `seg`
-            self.seg[i] = self.op(self.seg[2*i+1], self.seg[2*i+2])
-            #Join intervals of children to fill non-leaf nodes of `span`
-            self.span[i] = [self.span[2*i+1][0], self.span[2*i+2][1]]
+                for i in range(lo, hi):
+                    seg[i] = op(seg[2*i], seg[2*i+1])
 
 
 
@@ -124,42 +224,35 @@ class Segtree:
         if L < 0 or R > self.n or L >= R:
             msg = f'[L,R] = [{L},{R}] but segtree only has {self.n} elements'
             raise IndexError(msg)
-        return self._help_me_query(L, R, 0)
-    
-    def _help_me_query(self, L: int, R: int, i: int):
-        '''
-        Helper function for query.
-        Returns the result of applying `op` on the interval `a[L:R]`
-        Has an extra input `i` that represents the index of `seg` and `span` 
-        currently being looked at to help traverse the segtree.
-        [L:R] will always be contained entirely inside self.span[i].
-        '''
-
-        #If [L:R] is exactly self.span[i], return the value in seg[i]
-        L_0 = self.span[i][0]   #Left end of seg[i]'s interval
-        R_0 = self.span[i][1]   #Right end of seg[i]'s interval
-        if L == L_0 and R == R_0:
-            return self.seg[i]
-        
-        #Check intervals of children of seg[i]
-        l = self.span[2*i+1][0]   #Left end of left child
-        m = self.span[2*i+1][1]   #Border of left and right child
-        r = self.span[2*i+2][1]   #Right end of right child
         
-        #If [L:R] is entirely in the left child of span[i]
-        if R <= m:
-            return self._help_me_query(L, R, 2*i+1)
-        #If [L:R] is entirely in the right child of span[i]
-        elif L >= m:
-            return self._help_me_query(L, R, 2*i+2)
-        #If [L:R] hits both the left and right child of span[i]
-        else:
-            #Ans of part of [L:R] in left subtree
-            ans_L = self._help_me_query(L, m, 2*i+1)
-            #Ans of part of [L:R] in right subtree
-            ans_R = self._help_me_query(m, R, 2*i+2)
-            #Join to get the ans
-            return self.op(ans_L, ans_R)
+        #The whole array is answered by the root when `full` is True
+        if L == 0 and R == self.n and self.full:
+            return self.seg[1]
+
+        #Bind hot attributes to locals
+        seg = self.seg
+        op = self.op
+
+        #Walk up from the leaves of the half-open range [l:r] of `seg`.
+        #Left children have even indices and right children odd ones.
+        l = L + self.n          #Index of the leftmost leaf in range
+        r = R + self.n          #Index one past the rightmost leaf in range
+        ans_L = self.identity   #Ans of the part of [L:R] left of `l`
+        ans_R = self.identity   #Ans of the part of [L:R] right of `r`
+        while l < r:
+            #If `l` is a right child, its parent sticks out to the left
+            if l & 1:
+                ans_L = op(ans_L, seg[l])
+                l += 1
+            #If `r` is a right child, then `r-1` is a left child whose
+            #parent sticks out to the right
+            if r & 1:
+                r -= 1
+                ans_R = op(seg[r], ans_R)
+            #Go to parents
+            l >>= 1
+            r >>= 1
+        return op(ans_L, ans_R)
 
 
 
@@ -192,12 +285,76 @@ class Segtree:
         if ind < 0:
             ind += self.n
         
-        k = self.l//2       #Number of non-leaf nodes
-        i = k + ind         #Index of [ind:ind+1] in seg
-        self.seg[i] = val   #Update seg[i]
-        while i > 0:        #While not yet at root, go to parent and update
-            i = (i-1)//2
-            self.seg[i] = self.op(self.seg[2*i+1], self.seg[2*i+2])
+        seg = self.seg
+        op = self.op
+        i = self.n + ind   #Index of [ind:ind+1] in seg
+        seg[i] = val       #Update seg[i]
+        #While not yet at root, go to parent and update. The new value 
+        #of the current node is carried in `val`, so only its sibling 
+        #needs to be read from `seg`.
+        while i > 1:
+            if i & 1:
+                val = op(seg[i-1], val)
+            else:
+                val = op(val, seg[i+1])
+            i >>= 1
+            seg[i] = val
+
+
+
+    def update_many(self, pairs) -> None:
+        '''
+        Updates the element at index `ind` to `val` for every pair 
+        `(ind, val)` in `pairs`, then updates the segtree accordingly.
+        Each node above the updated leaves is recomputed exactly once, 
+        instead of once per update as with repeated calls to `update`.
+        Later pairs take precedence for repeated indices.
+        Requires `-n <= ind <= n-1` for every `ind`.
+
+        Time complexity: `O(m + d + logn)` for `m` pairs with `d` 
+        distinct affected ancestors, which is at most `O(mlogn)`
+
+        Parameters
+        ----------
+        `pairs` : iterable of (int, T)
+            The indices being updated and their new values
+
+        Raises
+        ------
+        IndexError
+            When an `ind` is out of bounds, before anything is updated
+        '''
+        n = self.n
+        seg = self.seg
+        op = self.op
+
+        #Check that every ind is valid and shift negative ones back up
+        leaves = []
+        for ind, val in pairs:
+            if ind >= n or ind < -n:
+                msg = f'Getting from index out of range: ind = {ind}'
+                raise IndexError(msg)
+            if ind < 0:
+                ind += n
+            leaves.append((n + ind, val))
+
+        #Update the leaves and mark their parents as dirty. 
+        #The depth of node `i` is `i.bit_length()`, and leaves can be at 
+        #two different depths, so dirty nodes are grouped by depth.
+        dirty = [set() for d in range((2*n - 1).bit_length())]
+        for i, val in leaves:
+            seg[i] = val
+            i >>= 1
+            if i > 0:
+                dirty[i.bit_length()].add(i)
+
+        #Recompute one level at a time from the bottom up, so children 
+        #are recomputed before their parents, then mark the parents
+        for d in range(len(dirty)-1, 0, -1):
+            for i in dirty[d]:
+                seg[i] = op(seg[2*i], seg[2*i+1])
+                if i > 1:
+                    dirty[d-1].add(i >> 1)
 
 
 
@@ -230,9 +387,7 @@ class Segtree:
         if ind < 0:
             ind += self.n
 
-        k = self.l//2   #Number of non-leaf nodes
-        i = k + ind     #Index of [ind:ind+1] in seg
-        return self.seg[i]
+        return self.seg[self.n + ind]   #Index of [ind:ind+1] in seg
 
 
 
@@ -246,33 +401,369 @@ class Segtree:
         -------
         A copy of the underlying array
         '''
-        k = self.l//2                 #Number of non-leaf nodes
-        return self.seg[k:k+self.n]   #Slice non-None part of bottom layer
+        return self.seg[self.n:]   #Slice the leaves
+
+
+
+    def iter_arr(self):
+        '''
+        Returns an iterator over the underlying array, without 
+        allocating a copy of it like `arr` does.
+        The segtree should not be updated while iterating.
+
+        Time complexity: `O(n)` to iterate through
+
+        Returns
+        -------
+        An iterator over the underlying array
+        '''
+        return islice(self.seg, self.n, None)   #Iterate over the leaves
+
+
+
+    def __len__(self) -> int:
+        '''Returns the number of items in the underlying array'''
+        return self.n
+
+    def __getitem__(self, ind: int):
+        '''
+        Same as `get(ind)`, inlined to save a method call.
+        Allows `seg[ind]` to be used in place of `seg.get(ind)`.
+        '''
+        n = self.n
+        #Check that ind is a valid index
+        if ind >= n or ind < -n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += n
+        return self.seg[n + ind]
+
+    def __setitem__(self, ind: int, val) -> None:
+        '''
+        Same as `update(ind, val)`, inlined to save a method call.
+        Allows `seg[ind] = val` to be used in place of `seg.update(ind, val)`.
+        '''
+        n = self.n
+        #Check that ind is a valid index
+        if ind >= n or ind < -n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += n
+
+        seg = self.seg
+        op = self.op
+        i = n + ind
+        seg[i] = val
+        while i > 1:
+            if i & 1:
+                val = op(seg[i-1], val)
+            else:
+                val = op(val, seg[i+1])
+            i >>= 1
+            seg[i] = val
 
 
 
     @staticmethod
-    def _ceil_log_2(n):
+    def _np_build(leaves: 'np.ndarray', op_name: str):
         '''
-        Utility function to get the value of 
-            ceil(log_2(n))
-        Used to get the size of the array needed to store the segtree.
+        Utility function to build `seg` with numpy for a named operation.
+        Each level (see `_levels`) is filled with a single ufunc call on 
+        the slices of its children.
+        Returns `seg` as a numpy array along with the identity of the 
+        operation that fits in the dtype of `leaves`.
         '''
-        
-        ans = 0
-        exact = True   #True iff n is an exact power of 2
-
-        #Iterate from LSB to MSB
-        while n > 1:
-            #If any bit except the MSB is 1, then not exact
-            if n%2 == 1:
-                exact = False
-            #floor_log_2(n) = number of bits - 1
-            ans += 1
-            n >>= 1
-        
-        #Add an extra 1 if it is not exact
-        if exact:
-            return ans
+        ufunc = {
+            'sum': np.add,
+            'min': np.minimum,
+            'max': np.maximum,
+            'xor': np.bitwise_xor,
+        }[op_name]
+        n = len(leaves)
+
+        #Pick an identity that fits in the dtype of the leaves
+        if op_name in ('sum', 'xor'):
+            identity = 0
+        elif np.issubdtype(leaves.dtype, np.integer):
+            info = np.iinfo(leaves.dtype)
+            identity = info.max if op_name == 'min' else info.min
         else:
-            return ans+1
+            identity = np.inf if op_name == 'min' else -np.inf
+
+        seg = np.full(2*n, identity, dtype=leaves.dtype)
+        seg[n:] = leaves
+
+        for lo, hi in Segtree._levels(n):
+            seg[lo:hi] = ufunc(seg[2*lo:2*hi:2], seg[2*lo+1:2*hi:2])
+        return seg, identity
+
+
+
+    @staticmethod
+    def _levels(n: int):
+        '''
+        Utility function to split the non-leaf nodes of a segtree with 
+        `n` leaves into levels, from the bottom up.
+        Yields pairs `(lo, hi)` such that nodes `[lo:hi]` have children 
+        `[2*lo:2*hi]`, which are all at indices `>= hi` and hence are 
+        computed by an earlier level.
+
+        Each level reads one contiguous block of children and writes 
+        one contiguous block of parents, so the build streams through 
+        `seg` once per level rather than jumping around it. Levels 
+        halve in size, so all but the first few fit in cache.
+        '''
+        hi = n
+        while hi > 1:
+            lo = (hi+1) // 2
+            yield lo, hi
+            hi = lo
+
+
+
+#Join operators of the named operations, compiled for the kernels
+@njit
+def _nb_add(a, b):
+    return a + b
+
+@njit
+def _nb_min(a, b):
+    return min(a, b)
+
+@njit
+def _nb_max(a, b):
+    return max(a, b)
+
+@njit
+def _nb_xor(a, b):
+    return a ^ b
+
+@njit
+def _nb_update(seg, n, ind, val, combine):
+    '''Kernel of `SegtreeNumeric.update` on the `2n` layout'''
+    i = n + ind
+    seg[i] = val
+    while i > 1:
+        i >>= 1
+        seg[i] = combine(seg[2*i], seg[2*i+1])
+
+@njit
+def _nb_query(seg, n, L, R, combine, identity):
+    '''
+    Kernel of `SegtreeNumeric.query` on the `2n` layout.
+    All named operations are commutative, so one accumulator suffices.
+    '''
+    ans = identity
+    l = L + n
+    r = R + n
+    while l < r:
+        if l & 1:
+            ans = combine(ans, seg[l])
+            l += 1
+        if r & 1:
+            r -= 1
+            ans = combine(ans, seg[r])
+        l >>= 1
+        r >>= 1
+    return ans
+
+
+
+class SegtreeNumeric(Segtree):
+    '''
+    A segtree for numeric arrays and a named operation, stored in a 
+    numpy array with `query` and `update` compiled by numba.
+    Uses the same `2n` layout as `Segtree`. Use `Segtree` for any 
+    other join operation.
+
+    Unlike `Segtree`, values are stored with the numpy dtype of the 
+    tree: integer sums wrap around on overflow, and `update` casts 
+    the new value to the dtype, so e.g. `2.7` becomes `2` in an int 
+    tree. Methods still return Python scalars.
+
+    Requires numpy. Without numba it still works, but the kernels run 
+    as plain Python on the numpy array and are slower than `Segtree`.
+
+    Public Methods Summary:
+        __init__(self, a, op_name, dtype=None)
+            Creates a segtree with underlying array a and operation op_name
+    '''
+
+    #Instance attributes (in addition to those of `Segtree`)
+    #    seg   - numpy array storing the main segtree
+    #    nb_op - Compiled join operator passed to the kernels
+    __slots__ = ('nb_op',)
+
+    #op_name -> compiled join operator
+    _NB_OPS = {'sum': _nb_add, 'min': _nb_min, 'max': _nb_max, 'xor': _nb_xor}
+
+
+
+    def __init__(self, a: list, op_name: str, dtype=None) -> 'SegtreeNumeric':
+        '''
+        Initializes a numeric segtree from an array and operation name.
+
+        Time complexity: `O(n)`
+
+        Parameters
+        ----------
+        `a` : list
+            The inputted array
+        `op_name` : str
+            One of `'sum'`, `'min'`, `'max'`, `'xor'`
+        `dtype` : optional
+            numpy dtype of the segtree. Inferred from `a` if not given, 
+            with bools stored as ints so that sums count them.
+
+        Returns
+        -------
+            A segtree initialized from `a` and operation `op_name`
+
+        Raises
+        ------
+        ImportError
+            When numpy is not installed
+        ValueError
+            When `op_name` is not a known operation, or when the dtype 
+            is not an int or float dtype (e.g. ints past 64 bits give 
+            an object dtype), or is a float dtype for `'xor'`
+        '''
+        if np is None:
+            raise ImportError('SegtreeNumeric requires numpy')
+        if op_name not in SegtreeNumeric._NB_OPS:
+            raise ValueError(f'Unknown op_name: {op_name}')
+
+        self.n = len(a)
+        self.op = Segtree._NAMED_OPS[op_name][0]
+        self.nb_op = SegtreeNumeric._NB_OPS[op_name]
+        self.full = True
+        leaves = np.asarray(a, dtype=dtype)
+        #Bool sums would act as a logical or
+        if leaves.dtype.kind == 'b':
+            leaves = leaves.astype(np.int64)
+        kinds = 'iu' if op_name == 'xor' else 'iuf'
+        if leaves.dtype.kind not in kinds:
+            msg = f'SegtreeNumeric cannot {op_name} dtype {leaves.dtype}'
+            raise ValueError(msg)
+        self.seg, self.identity = Segtree._np_build(leaves, op_name)
+
+
+
+    def query(self, L: int, R: int):
+        '''
+        Returns the result of applying the operation on the interval 
+        `[L:R]` of the underlying array. See `Segtree.query`.
+        '''
+        #Check that [L:R] is a valid interval
+        if L < 0 or R > self.n or L >= R:
+            msg = f'[L,R] = [{L},{R}] but segtree only has {self.n} elements'
+            raise IndexError(msg)
+        #The whole array is answered by the root
+        if L == 0 and R == self.n:
+            return self.seg[1].item()
+        ans = _nb_query(self.seg, self.n, L, R, self.nb_op, self.identity)
+        #Without numba the kernel returns a numpy scalar
+        return np.asarray(ans).item()
+
+
+
+    def update(self, ind: int, val) -> None:
+        '''
+        Updates the element at index `ind` to `val` and updates the 
+        segtree accordingly. See `Segtree.update`.
+        '''
+        #Check that ind is a valid index
+        if ind >= self.n or ind < -self.n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += self.n
+        _nb_update(self.seg, self.n, ind, val, self.nb_op)
+
+    __setitem__ = update
+
+
+
+    def update_many(self, pairs) -> None:
+        '''
+        Updates the element at index `ind` to `val` for every pair
+        `(ind, val)` in `pairs`, then updates the segtree accordingly.
+        See `Segtree.update_many`.
+        Runs the compiled `update` kernel once per pair, which is faster
+        than recomputing each node once with the operation in Python.
+
+        Time complexity: `O(mlogn)` for `m` pairs
+        '''
+        n = self.n
+
+        #Check that every ind is valid and shift negative ones back up
+        leaves = []
+        for ind, val in pairs:
+            if ind >= n or ind < -n:
+                msg = f'Getting from index out of range: ind = {ind}'
+                raise IndexError(msg)
+            if ind < 0:
+                ind += n
+            leaves.append((ind, val))
+
+        for ind, val in leaves:
+            _nb_update(self.seg, n, ind, val, self.nb_op)
+
+
+
+    def get(self, ind: int):
+        '''
+        Returns the item at index `ind` in the underlying array as a 
+        Python scalar. See `Segtree.get`.
+        '''
+        #Check that ind is a valid index
+        if ind >= self.n or ind < -self.n:
+            raise IndexError(f'Getting from index out of range: ind = {ind}')
+        #If ind < 0, shift it back up to be positive
+        if ind < 0:
+            ind += self.n
+        return self.seg[self.n + ind].item()
+
+    __getitem__ = get
+
+
+
+    def arr(self):
+        '''
+        Creates and returns a copy of the underlying array as a list.
+
+        Time complexity: `O(n)`
+        '''
+        return self.seg[self.n:].tolist()
+
+
+
+    def iter_arr(self):
+        '''
+        Returns an iterator over the underlying array as Python scalars, 
+        without copying it. See `Segtree.iter_arr`.
+        '''
+        return (x.item() for x in self.seg[self.n:])
+
+
+
+#Optional compiled port of `Segtree` (see CSegtree.pyx), built with
+#    cythonize -i CSegtree.pyx
+#Falls back to a pure Python `Segtree` if it has not been built
+try:
+    from CSegtree import CSegtree
+except ImportError:
+    class CSegtree(Segtree):
+        '''
+        Pure Python fallback for `CSegtree` when it is not built.
+        A `Segtree` with a named operation, so unlike the compiled 
+        class, values are Python ints that do not wrap around at 64 
+        bits. Otherwise both have the same public methods.
+        '''
+        __slots__ = ()
+
+        def __init__(self, a: list, op_name: str) -> 'CSegtree':
+            '''Initializes a segtree from an array and operation name'''
+            super().__init__(a, op_name=op_name)
@@ -2,6 +2,10 @@
 #Test was run without error about 35 times
 from random import *
 from Segtree import *
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 a = [randrange(0,9) for i in range(50)]
 seggs = Segtree(a, lambda x,y: x+y)
@@ -34,3 +38,155 @@ copy = seggs.arr()
 for i in range(50):
     if i != copy[i]:
         print(f'Array copy index {i} wrong')
+#Test query with a non-commutative op
+b = [chr(ord('a') + i%26) for i in range(37)]
+seggs_str = Segtree(b, lambda x,y: x+y)
+for i in range(37):
+    for j in range(i+1,38):
+        if seggs_str.query(i,j) != ''.join(b[i:j]):
+            print(f'string [L:R] = [{i},{j}] failed')
+#Test identity padding
+c = [randrange(-99,99) for i in range(45)]
+seggs_min = Segtree(c, min, float('inf'))
+for i in range(45):
+    for j in range(i+1,46):
+        if seggs_min.query(i,j) != min(c[i:j]):
+            print(f'min [L:R] = [{i},{j}] failed')
+#Test named operations
+for name, f in [('sum', sum), ('min', min), ('max', max)]:
+    seggs_named = Segtree(c, op_name=name)
+    for i in range(45):
+        for j in range(i+1,46):
+            if seggs_named.query(i,j) != f(c[i:j]):
+                print(f'{name} [L:R] = [{i},{j}] failed')
+#Test named operations match the same ops given as functions, 
+#including for ints past 64 bits and bools, with or without numpy
+big = [2**62]*4 + [-5, 7, 1, 3]
+for name, f, e in [('sum', lambda x,y: x+y, 0), 
+                   ('min', min, float('inf')), 
+                   ('max', max, float('-inf'))]:
+    seggs_named = Segtree(big, op_name=name)
+    seggs_func = Segtree(big, f, e)
+    seggs_named[4] = seggs_func[4] = -10**20
+    seggs_named[5] = seggs_func[5] = -10**21
+    for i in range(8):
+        for j in range(i+1,9):
+            if seggs_named.query(i,j) != seggs_func.query(i,j):
+                print(f'big {name} [L:R] = [{i},{j}] failed')
+if Segtree([True, True], op_name='sum').query(0,2) != 2:
+    print('bool sum failed')
+#Test mixed ints and floats keep their types, as with a function
+mixed = [1, 2.5, 3, 2**60+1, 0.5]
+seggs_named = Segtree(mixed, op_name='max')
+if seggs_named.arr() != mixed or type(seggs_named[0]) is not int:
+    print('mixed arr failed')
+if seggs_named.query(3,4) != 2**60+1:
+    print('mixed query failed')
+#Test only float64 dtypes are allowed
+if Segtree([1, 2, 3], op_name='sum', dtype=float).query(0,3) != 6.0:
+    print('float dtype failed')
+if np is not None:
+    try:
+        Segtree([2**30]*4, op_name='sum', dtype=np.int32)
+        print('int32 dtype did not raise')
+    except ValueError:
+        pass
+#Test exactly one of op and op_name must be given
+for kwargs in [{}, {'op': min, 'op_name': 'min'}]:
+    try:
+        Segtree(c, **kwargs)
+        print(f'Segtree(c, **{kwargs}) did not raise')
+    except ValueError:
+        pass
+#Test numeric segtree (needs numpy)
+if np is not None:
+    seggs_num = SegtreeNumeric(c, 'min')
+    for i in range(45):
+        seggs_num.update(i, c[-1-i])
+    c_ = c[::-1]
+    for i in range(45):
+        for j in range(i+1,46):
+            ans = seggs_num.query(i,j)
+            if type(ans) is not int or ans != min(c_[i:j]):
+                print(f'numeric min [L:R] = [{i},{j}] failed')
+    if seggs_num.arr() != c_:
+        print('numeric arr failed')
+    for i in range(-45,45):
+        if type(seggs_num[i]) is not int or seggs_num[i] != c_[i]:
+            print(f'numeric seggs_num[{i}] failed')
+    if any(type(x) is not int for x in seggs_num.iter_arr()):
+        print('numeric iter_arr failed')
+    #Test numeric update_many, which checks every index first
+    pairs = [(randrange(-45,45), randrange(0,100)) for i in range(30)]
+    for ind, val in pairs:
+        c_[ind] = val
+    seggs_num.update_many(pairs)
+    for i in range(45):
+        for j in range(i+1,46):
+            if seggs_num.query(i,j) != min(c_[i:j]):
+                print(f'numeric update_many [L:R] = [{i},{j}] failed')
+    try:
+        seggs_num.update_many([(0, -1), (45, 0)])
+        print('numeric update_many did not raise')
+    except IndexError:
+        if seggs_num[0] != c_[0]:
+            print('numeric update_many updated before raising')
+    #Test bools are summed as ints and other dtypes raise
+    if SegtreeNumeric([True]*3 + [False], 'sum').query(0,3) != 3:
+        print('numeric bool sum failed')
+    for a, name in [([2**70, 1, 2], 'sum'), (['a', 'b'], 'max'),
+                    ([1.5, 2.5], 'xor')]:
+        try:
+            SegtreeNumeric(a, name)
+            print(f'SegtreeNumeric({a}, {name!r}) did not raise')
+        except ValueError:
+            pass
+#Test len, indexing and item assignment
+if len(seggs) != 50:
+    print('len(seggs) failed')
+for i in range(-50,50):
+    if seggs[i] != seggs.get(i):
+        print(f'seggs[{i}] failed')
+for i in range(50):
+    seggs[i] = 2*i
+for i in range(50):
+    for j in range(i+1,51):
+        if seggs.query(i,j) != sum(range(2*i,2*j,2)):
+            print(f'assigned [L:R] = [{i},{j}] failed')
+#Test update_many
+pairs = [(randrange(-50,50), randrange(0,9)) for i in range(30)]
+a_ = [2*i for i in range(50)]
+for ind, val in pairs:
+    a_[ind] = val
+seggs.update_many(pairs)
+for i in range(50):
+    for j in range(i+1,51):
+        if seggs.query(i,j) != sum(a_[i:j]):
+            print(f'update_many [L:R] = [{i},{j}] failed')
+#Test iter_arr
+if list(seggs.iter_arr()) != seggs.arr():
+    print('iter_arr failed')
+#Test compiled segtree (or its pure Python fallback)
+seggs_c = CSegtree(c, 'max')
+for i in range(45):
+    for j in range(i+1,46):
+        if seggs_c.query(i,j) != max(c[i:j]):
+            print(f'compiled max [L:R] = [{i},{j}] failed')
+if not isinstance(seggs_c, CSegtree):
+    print('compiled isinstance failed')
+#Test the methods shared by the compiled segtree and its fallback
+if len(seggs_c) != 45 or list(seggs_c.iter_arr()) != c:
+    print('compiled len/iter_arr failed')
+c_ = c[:]
+for i in range(-45,45):
+    seggs_c[i] = c_[i] = c_[i] + i
+    if seggs_c[i] != c_[i]:
+        print(f'compiled seggs_c[{i}] failed')
+pairs = [(randrange(-45,45), randrange(0,100)) for i in range(30)]
+for ind, val in pairs:
+    c_[ind] = val
+seggs_c.update_many(pairs)
+for i in range(45):
+    for j in range(i+1,46):
+        if seggs_c.query(i,j) != max(c_[i:j]):
+            print(f'compiled update_many [L:R] = [{i},{j}] failed')